@@ -2,7 +2,8 @@
 Space Shooter / Platformer (single-file Pygame game)
 Save as: space_platformer.py
 Run: python space_platformer.py
-Requires: pygame (pip install pygame)
+Requires: pygame, numpy (pip install pygame numpy)
+Optional: numba (pip install numba) to JIT-compile the player physics step
 
 Controls:
       - Left / Right arrows (A / D) : move
@@ -13,10 +14,19 @@ Controls:
 """
 
 import pygame
+import numpy as np
 import random
 import math
 from collections import deque
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; run the physics step as plain Python
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
 # -----------------------------
 # Settings
 # -----------------------------
@@ -26,11 +36,12 @@ FPS = 60
 GRAVITY = 0.8
 PLAYER_ACC = 0.6
 PLAYER_FRICTION = -0.12
-PLAYER_JUMP_VELOCITY = -14
-PLAYER_MAX_SPEED = 8
+PLAYER_JUMP_VELOCITY = -14.0
+PLAYER_MAX_SPEED = 8.0
 
 BULLET_SPEED = 14
 ENEMY_BULLET_SPEED = 6
+BULLET_POOL_SIZE = 256
 
 # Colors
 WHITE = (245, 245, 245)
@@ -43,6 +54,10 @@ ENEMY_COLOR = (200, 60, 60)
 BULLET_COLOR = (255, 220, 100)
 HUD_COLOR = (220, 220, 220)
 
+# Keys polled every frame (bound once so the hot path skips the module lookup)
+K_LEFT, K_RIGHT, K_A, K_D = pygame.K_LEFT, pygame.K_RIGHT, pygame.K_a, pygame.K_d
+K_SHOOT = pygame.K_j
+
 # -----------------------------
 # Pygame init
 # -----------------------------
@@ -62,12 +77,24 @@ big_font = pygame.font.SysFont("arial", 48)
 # -----------------------------
 # Utility functions
 # -----------------------------
+_font_cache = {}
+_text_cache = {}
+TEXT_CACHE_LIMIT = 256
+
+
 def draw_text(surf, text, size, x, y, color=HUD_COLOR, center=False):
     if isinstance(size, int):
-        f = pygame.font.SysFont("arial", size)
+        f = _font_cache.get(size)
+        if f is None:
+            f = _font_cache[size] = pygame.font.SysFont("arial", size)
     else:
         f = size
-    t = f.render(text, True, color)
+    key = (text, id(f), color)
+    t = _text_cache.get(key)
+    if t is None:
+        if len(_text_cache) >= TEXT_CACHE_LIMIT:
+            _text_cache.clear()  # changing scores would otherwise grow this forever
+        t = _text_cache[key] = f.render(text, True, color)
     r = t.get_rect()
     if center:
         r.center = (x, y)
@@ -76,71 +103,170 @@ def draw_text(surf, text, size, x, y, color=HUD_COLOR, center=False):
     surf.blit(t, r)
 
 
+HAS_FBLITS = hasattr(pygame.Surface, "fblits")  # pygame-ce only
+
+
+def blit_many(surf, blit_list):
+    # one C call for a list of (image, dest) pairs
+    if HAS_FBLITS:
+        surf.fblits(blit_list)
+    else:
+        surf.blits(blit_list, doreturn=False)
+
+
+@njit(cache=True)
+def step_player(vx, vy, ax, ay, friction, max_speed, dt):
+    # integrate one frame; returns new velocity and the position delta
+    vx += ax
+    vy += ay
+    # friction
+    vx += vx * friction
+    # clamp speed
+    if vx > max_speed:
+        vx = max_speed
+    if vx < -max_speed:
+        vx = -max_speed
+    dx = vx * dt
+    dy = vy * dt + 0.5 * ay * dt * dt
+    return vx, vy, dx, dy
+
+
 # -----------------------------
 # Game Objects
 # -----------------------------
 class Camera:
     def __init__(self, width, height):
-        self.offset = pygame.Vector2(0, 0)
+        self.offset_x = self.offset_y = 0  # ints, so draw code can add them without casting
         self.width = width
         self.height = height
 
-    def apply(self, rect):
-        return rect.move(-self.offset.x, -self.offset.y)
-
     def update(self, target_rect):
         # center camera on target with bounds
-        self.offset.x = max(0, min(target_rect.centerx - WIDTH // 2, self.width - WIDTH))
-        self.offset.y = max(0, min(target_rect.centery - HEIGHT // 2, self.height - HEIGHT))
+        self.offset_x = max(0, min(target_rect.centerx - WIDTH // 2, self.width - WIDTH))
+        self.offset_y = max(0, min(target_rect.centery - HEIGHT // 2, self.height - HEIGHT))
+
+
+_plat_cache = {}  # (w, h) -> Surface; platforms of the same size share one image
+
+
+def platform_image(w, h):
+    img = _plat_cache.get((w, h))
+    if img is None:
+        img = _plat_cache[(w, h)] = pygame.Surface((w, h))
+        img.fill(PLATFORM_COLOR)
+    return img
 
 
 class Platform(pygame.sprite.Sprite):
     def __init__(self, x, y, w, h):
         super().__init__()
-        self.image = pygame.Surface((w, h))
-        self.image.fill(PLATFORM_COLOR)
+        self.image = platform_image(w, h)
         self.rect = self.image.get_rect(topleft=(x, y))
-
-
-class Bullet(pygame.sprite.Sprite):
-    def __init__(self, x, y, dx, dy, owner="player"):
-        super().__init__()
-        self.image = pygame.Surface((8, 4))
-        self.image.fill(BULLET_COLOR)
-        if abs(dy) > abs(dx):
-            self.image = pygame.Surface((4, 8))
-            self.image.fill(BULLET_COLOR)
-        self.rect = self.image.get_rect(center=(x, y))
-        self.vel = pygame.Vector2(dx, dy)
-        self.owner = owner
+        self.edge_rect = self.rect.inflate(0, 6)  # static, used by patrol edge checks
+
+
+# shared by every bullet; nothing allocates a Surface at shot time
+_bullet_surf_h = pygame.Surface((8, 4))
+_bullet_surf_h.fill(BULLET_COLOR)
+_bullet_surf_v = pygame.Surface((4, 8))
+_bullet_surf_v.fill(BULLET_COLOR)
+
+
+class BulletPool:
+    # struct-of-arrays bullet storage: one vectorized step moves every bullet
+    def __init__(self, capacity=BULLET_POOL_SIZE):
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros_like(self.pos)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.vertical = np.zeros(capacity, dtype=bool)
+        self.free = deque(range(capacity))  # retired slots, reused before anything else
+
+    def spawn(self, x, y, dx, dy):
+        if not self.free:
+            return False  # pool exhausted, drop the shot
+        i = self.free.popleft()
+        self.pos[i] = (x, y)
+        self.vel[i] = (dx, dy)
+        self.vertical[i] = abs(dy) > abs(dx)
+        self.alive[i] = True
+        return True
+
+    def kill(self, i):
+        if self.alive[i]:
+            self.alive[i] = False
+            self.free.append(int(i))
+
+    def indices(self):
+        return np.flatnonzero(self.alive)
+
+    def rect(self, i):
+        x, y = self.pos[i]
+        if self.vertical[i]:
+            return pygame.Rect(int(x) - 2, int(y) - 4, 4, 8)
+        return pygame.Rect(int(x) - 4, int(y) - 2, 8, 4)
+
+    def image(self, i):
+        return _bullet_surf_v if self.vertical[i] else _bullet_surf_h
+
+    def collide(self, boxes):
+        # boxes: (M, 4) array of left, top, right, bottom
+        # returns live bullet indices and their (N, M) AABB overlap matrix
+        idx = self.indices()
+        pos = self.pos[idx].astype(np.int32)
+        vert = self.vertical[idx]
+        hw = np.where(vert, 2, 4)
+        hh = np.where(vert, 4, 2)
+        bx0 = (pos[:, 0] - hw)[:, None]
+        by0 = (pos[:, 1] - hh)[:, None]
+        bx1 = bx0 + 2 * hw[:, None]
+        by1 = by0 + 2 * hh[:, None]
+        hits = (bx0 < boxes[:, 2]) & (bx1 > boxes[:, 0]) & (by0 < boxes[:, 3]) & (by1 > boxes[:, 1])
+        return idx, hits
 
     def update(self, dt, level_width, level_height):
-        self.rect.x += int(self.vel.x * dt)
-        self.rect.y += int(self.vel.y * dt)
+        alive = self.alive
+        self.pos[alive] += self.vel[alive] * dt
+        x, y = self.pos[:, 0], self.pos[:, 1]
         # remove if offscreen in level coordinates
-        if (self.rect.right < 0 or self.rect.left > level_width or
-                self.rect.bottom < 0 or self.rect.top > level_height):
-            self.kill()
+        gone = alive & ~((x >= 0) & (x <= level_width) & (y >= 0) & (y <= level_height))
+        if gone.any():
+            alive &= ~gone
+            self.free.extend(np.flatnonzero(gone).tolist())
+
+    def visible(self, view):
+        # indices of live bullets whose center lies within view (padded by the sprite size),
+        # horizontal ones first so blits from the same surface run back to back
+        x, y = self.pos[:, 0], self.pos[:, 1]
+        mask = (self.alive & (x >= view.left - 4) & (x < view.right + 4) &
+                (y >= view.top - 4) & (y < view.bottom + 4))
+        idx = np.flatnonzero(mask)
+        return idx[np.argsort(self.vertical[idx], kind="stable")]
+
+
+# one image per enemy kind, shared by every enemy of that kind
+PATROL_IMG = pygame.Surface((36, 34))
+PATROL_IMG.fill(ENEMY_COLOR)
+FLY_IMG = pygame.Surface((36, 34))
+FLY_IMG.fill(ENEMY_COLOR)
 
 
 class Enemy(pygame.sprite.Sprite):
     def __init__(self, x, y, kind="patrol"):
         super().__init__()
         self.kind = kind
-        self.image = pygame.Surface((36, 34))
-        self.image.fill(ENEMY_COLOR)
+        self.image = PATROL_IMG if kind == "patrol" else FLY_IMG
         self.rect = self.image.get_rect(center=(x, y))
         self.health = 2 if kind == "patrol" else 4
         self.speed = 2 if kind == "patrol" else 1.2
         self.direction = random.choice([-1, 1])
         self.shoot_cool = random.randint(40, 120)
 
-    def update(self, dt, platforms, bullets_group, player):
+    def update(self, dt, level, bullets, pcx, pcy, bob):
         if self.kind == "patrol":
             self.rect.x += int(self.speed * self.direction * dt)
             # flip on platform edges
-            hits = [p for p in platforms if self.rect.colliderect(p.rect.inflate(0, 6))]
-            if not hits:
+            nearby = level.query(self.rect.inflate(0, 6))
+            if not any(self.rect.colliderect(p.edge_rect) for p in nearby):
                 self.direction *= -1
             else:
                 # small chance to change direction
@@ -148,22 +274,21 @@ class Enemy(pygame.sprite.Sprite):
                     self.direction *= -1
         elif self.kind == "fly":
             # floating movement toward player horizontally, bob vertically
-            if player.rect.centerx < self.rect.centerx:
+            if pcx < self.rect.centerx:
                 self.rect.x -= int(self.speed * dt)
             else:
                 self.rect.x += int(self.speed * dt)
-            self.rect.y += int(math.sin(pygame.time.get_ticks() / 400) * 0.8)
+            self.rect.y += int(bob)
 
         # shooting
         self.shoot_cool -= 1
         if self.shoot_cool <= 0:
-            dx = player.rect.centerx - self.rect.centerx
-            dy = player.rect.centery - self.rect.centery
+            dx = pcx - self.rect.centerx
+            dy = pcy - self.rect.centery
             dist = math.hypot(dx, dy) or 1
             vx = (dx / dist) * ENEMY_BULLET_SPEED
             vy = (dy / dist) * ENEMY_BULLET_SPEED
-            b = Bullet(self.rect.centerx, self.rect.centery, vx, vy, owner="enemy")
-            bullets_group.add(b)
+            bullets.spawn(self.rect.centerx, self.rect.centery, vx, vy)
             self.shoot_cool = random.randint(80, 160)
 
 
@@ -174,9 +299,9 @@ class Player(pygame.sprite.Sprite):
         self.image = pygame.Surface((self.width, self.height))
         self.image.fill(PLAYER_COLOR)
         self.rect = self.image.get_rect(midbottom=(x, y))
-        self.pos = pygame.Vector2(self.rect.x, self.rect.y)
-        self.vel = pygame.Vector2(0, 0)
-        self.acc = pygame.Vector2(0, 0)
+        self.px, self.py = float(self.rect.x), float(self.rect.y)
+        self.vx = self.vy = 0.0
+        self.ax = self.ay = 0.0
         self.on_ground = False
         self.facing = 1
         self.shoot_cool = 0
@@ -186,70 +311,66 @@ class Player(pygame.sprite.Sprite):
         self.lives = 3
 
     def handle_input(self, keys):
-        self.acc = pygame.Vector2(0, GRAVITY)
-        left = keys[pygame.K_LEFT] or keys[pygame.K_a]
-        right = keys[pygame.K_RIGHT] or keys[pygame.K_d]
+        self.ax, self.ay = 0.0, GRAVITY
+        left = keys[K_LEFT] | keys[K_A]
+        right = keys[K_RIGHT] | keys[K_D]
         if left:
-            self.acc.x = -PLAYER_ACC
+            self.ax = -PLAYER_ACC
             self.facing = -1
         if right:
-            self.acc.x = PLAYER_ACC
+            self.ax = PLAYER_ACC
             self.facing = 1
 
-    def jump(self, platforms):
+    def jump(self, level):
         # only jump if on ground
         self.rect.y += 2
-        hits = pygame.sprite.spritecollide(self, platforms, False)
+        hits = self.collide_platforms(level)
         self.rect.y -= 2
         if hits or self.on_ground:
-            self.vel.y = PLAYER_JUMP_VELOCITY
+            self.vy = PLAYER_JUMP_VELOCITY
             self.on_ground = False
 
-    def shoot(self, bullets_group):
+    def shoot(self, bullets):
         if self.shoot_cool <= 0:
             dx = self.facing * BULLET_SPEED
-            b = Bullet(self.rect.centerx + self.facing * 20, self.rect.centery - 6, dx, 0, owner="player")
-            bullets_group.add(b)
+            bullets.spawn(self.rect.centerx + self.facing * 20, self.rect.centery - 6, dx, 0)
             self.shoot_cool = 12  # frames cooldown
 
-    def update(self, dt, platforms):
+    def collide_platforms(self, level):
+        return [p for p in level.query(self.rect) if self.rect.colliderect(p.rect)]
+
+    def update(self, dt, level):
         # apply physics
-        self.vel += self.acc
-        # friction
-        self.vel.x += self.vel.x * PLAYER_FRICTION
-        # clamp speed
-        if self.vel.x > PLAYER_MAX_SPEED:
-            self.vel.x = PLAYER_MAX_SPEED
-        if self.vel.x < -PLAYER_MAX_SPEED:
-            self.vel.x = -PLAYER_MAX_SPEED
+        self.vx, self.vy, dx, dy = step_player(self.vx, self.vy, self.ax, self.ay,
+                                               PLAYER_FRICTION, PLAYER_MAX_SPEED, float(dt))
 
         # update position
-        self.pos.x += self.vel.x * dt
-        self.rect.x = int(self.pos.x)
+        self.px += dx
+        self.rect.x = int(self.px)
         # horizontal collisions
-        hits = pygame.sprite.spritecollide(self, platforms, False)
+        hits = self.collide_platforms(level)
         for p in hits:
-            if self.vel.x > 0:
+            if self.vx > 0:
                 self.rect.right = p.rect.left
-            elif self.vel.x < 0:
+            elif self.vx < 0:
                 self.rect.left = p.rect.right
-            self.pos.x = self.rect.x
-            self.vel.x = 0
+            self.px = float(self.rect.x)
+            self.vx = 0.0
 
         # vertical
-        self.pos.y += self.vel.y * dt + 0.5 * self.acc.y * dt * dt
-        self.rect.y = int(self.pos.y)
-        hits = pygame.sprite.spritecollide(self, platforms, False)
+        self.py += dy
+        self.rect.y = int(self.py)
+        hits = self.collide_platforms(level)
         self.on_ground = False
         for p in hits:
-            if self.vel.y > 0:
+            if self.vy > 0:
                 self.rect.bottom = p.rect.top
                 self.on_ground = True
-                self.vel.y = 0
-            elif self.vel.y < 0:
+                self.vy = 0.0
+            elif self.vy < 0:
                 self.rect.top = p.rect.bottom
-                self.vel.y = 0
-            self.pos.y = self.rect.y
+                self.vy = 0.0
+            self.py = float(self.rect.y)
 
         # cooldowns
         if self.shoot_cool > 0:
@@ -272,7 +393,10 @@ class Level:
         self.height = height
         self.platforms = pygame.sprite.Group()
         self.enemies = pygame.sprite.Group()
+        self.cell_size = 128
         self._make_level()
+        self.star_surf = self._make_starfield()
+        self.length_label = font.render("Level length: " + str(self.width), True, HUD_COLOR)
 
     def _make_level(self):
         # ground
@@ -303,17 +427,43 @@ class Level:
                 e = Enemy(px + 40, py - 30, kind="patrol")
                 self.enemies.add(e)
 
+        # platforms never move, so bucket them once into a uniform grid
+        self.platform_grid = {}
+        cs = self.cell_size
+        for p in self.platforms:
+            for cx in range(p.rect.left // cs, p.rect.right // cs + 1):
+                for cy in range(p.rect.top // cs, p.rect.bottom // cs + 1):
+                    self.platform_grid.setdefault((cx, cy), []).append(p)
+
+    def query(self, rect):
+        # platforms sharing a grid cell with rect (broad phase only)
+        cs = self.cell_size
+        found = set()
+        for cx in range(rect.left // cs, rect.right // cs + 1):
+            for cy in range(rect.top // cs, rect.bottom // cs + 1):
+                cell = self.platform_grid.get((cx, cy))
+                if cell:
+                    found.update(cell)
+        return found
+
+    def _make_starfield(self):
+        # simple stars, plotted once; own RNG so the level's randomness is untouched
+        # colorkeyed + RLE rather than per-pixel alpha: the blit skips the empty runs
+        star_surf = pygame.Surface((self.width, self.height)).convert()
+        star_surf.fill(BLACK)
+        star_count = 120
+        rng = random.Random(123)  # deterministic star pattern
+        for i in range(star_count):
+            sx = rng.randint(0, self.width - 1)
+            sy = rng.randint(0, self.height - 1)
+            star_surf.set_at((sx, sy), (190, 190, 255))
+        star_surf.set_colorkey(BLACK, pygame.RLEACCEL)
+        return star_surf
+
     def draw_background(self, surf, camera):
         # parallax starfield-like gradient using bands
         surf.fill(SKY1)
-        # simple stars
-        star_count = 120
-        random.seed(123)  # deterministic star pattern
-        for i in range(star_count):
-            sx = random.randint(0, self.width) - int(camera.offset.x * 0.3)
-            sy = random.randint(0, self.height)
-            if 0 <= sx - camera.offset.x < WIDTH + 50:
-                surf.set_at((int(sx - camera.offset.x), int(sy - camera.offset.y) if 0 <= sy < HEIGHT else 0), (190, 190, 255))
+        surf.blit(self.star_surf, (-int(camera.offset_x * 0.3), -camera.offset_y))
 
 
 # -----------------------------
@@ -325,9 +475,10 @@ class Game:
         self.player = Player(120, HEIGHT - 200)
         self.camera = Camera(self.level.width, self.level.height)
         self.player_group = pygame.sprite.GroupSingle(self.player)
-        self.bullets = pygame.sprite.Group()
-        self.enemy_bullets = pygame.sprite.Group()
+        self.bullets = BulletPool()
+        self.enemy_bullets = BulletPool()
         self.hud_surf = pygame.Surface((WIDTH, 60), pygame.SRCALPHA)
+        self._hud_state = (None, None, None)  # (score, lives, health) last drawn into hud_surf
         self.state = "title"  # title, playing, paused, gameover
         self.spawn_timer = 0
 
@@ -336,107 +487,134 @@ class Game:
 
     def update(self, dt, keys):
         if self.state == "playing":
-            self.player.handle_input(keys)
-            # update player
-            self.player.update(dt, self.level.platforms)
+            player = self.player
+            level = self.level
+            lw, lh = level.width, level.height
+            enemy_group = level.enemies
+            bullets, enemy_bullets = self.bullets, self.enemy_bullets
 
-            # update enemies
-            for e in list(self.level.enemies):
-                e.update(dt, self.level.platforms, self.enemy_bullets, self.player)
+            player.handle_input(keys)
+            # update player
+            player.update(dt, level)
+            pr = player.rect
+            pcx, pcy = pr.centerx, pr.centery
+
+            # update enemies; the fly bob is shared, so evaluate it once per frame
+            # enemies well outside the view sleep: no movement, no shooting
+            bob = math.sin(pygame.time.get_ticks() / 400) * 0.8
+            active_rect = pygame.Rect(self.camera.offset_x, self.camera.offset_y, WIDTH, HEIGHT).inflate(400, 400)
+            for e in enemy_group.sprites():
+                if active_rect.colliderect(e.rect):
+                    e.update(dt, level, enemy_bullets, pcx, pcy, bob)
 
             # update bullets
-            for b in list(self.bullets):
-                b.update(1.0, self.level.width, self.level.height)
-            for b in list(self.enemy_bullets):
-                b.update(1.0, self.level.width, self.level.height)
-
-            # collisions: player bullets -> enemies
-            for b in list(self.bullets):
-                hit = pygame.sprite.spritecollideany(b, self.level.enemies)
-                if hit:
-                    hit.health -= 1
-                    # HIT_SOUND.play() if defined
-                    b.kill()
-                    if hit.health <= 0:
-                        hit.kill()
-                        self.player.score += 150
+            bullets.update(1.0, lw, lh)
+            enemy_bullets.update(1.0, lw, lh)
+
+            # collisions: player bullets -> enemies, all pairs tested in one broadcast
+            enemies = enemy_group.sprites()
+            if enemies:
+                boxes = np.array([e.rect for e in enemies], dtype=np.int32)  # x, y, w, h
+                boxes[:, 2:] += boxes[:, :2]  # -> left, top, right, bottom
+                idx, hits = bullets.collide(boxes)
+                if hits.any():
+                    for row in np.flatnonzero(hits.any(axis=1)):
+                        for j in np.flatnonzero(hits[row]):
+                            hit = enemies[j]
+                            if not hit.alive():
+                                continue
+                            hit.health -= 1
+                            # HIT_SOUND.play() if defined
+                            bullets.kill(idx[row])
+                            if hit.health <= 0:
+                                hit.kill()
+                                player.score += 150
+                            break
 
             # enemy bullets -> player
-            for b in list(self.enemy_bullets):
-                if self.player.rect.colliderect(b.rect):
-                    b.kill()
-                    died = self.player.take_damage(1)
-                    if died:
-                        self.player.health = self.player.max_health
-                        if self.player.lives < 0:
-                            self.state = "gameover"
-
-            # enemies touching player
-            hits = pygame.sprite.spritecollide(self.player, self.level.enemies, False)
-            for e in hits:
+            idx, hits = enemy_bullets.collide(np.array([(pr.left, pr.top, pr.right, pr.bottom)], dtype=np.int32))
+            for i in idx[hits[:, 0]]:
+                enemy_bullets.kill(i)
+                died = player.take_damage(1)
+                if died:
+                    player.health = player.max_health
+                    if player.lives < 0:
+                        self.state = "gameover"
+
+            # enemies touching player, tested against every survivor in one C call
+            enemies = enemy_group.sprites()
+            for j in pr.collidelistall([e.rect for e in enemies]):
+                e = enemies[j]
                 # simple bounce knockback
-                if self.player.rect.centery < e.rect.centery:
+                if pcy < e.rect.centery:
                     # landed on enemy -> damage enemy
                     e.health -= 2
-                    self.player.vel.y = PLAYER_JUMP_VELOCITY / 2
+                    player.vy = PLAYER_JUMP_VELOCITY / 2
                     if e.health <= 0:
                         e.kill()
-                        self.player.score += 200
+                        player.score += 200
                 else:
-                    died = self.player.take_damage(1)
+                    died = player.take_damage(1)
                     if died:
-                        self.player.health = self.player.max_health
-                        if self.player.lives < 0:
+                        player.health = player.max_health
+                        if player.lives < 0:
                             self.state = "gameover"
 
             # camera follow
-            self.camera.update(self.player.rect)
+            self.camera.update(pr)
 
             # spawn new enemies if too few
-            if len(self.level.enemies) < 6:
+            if len(enemy_group) < 6:
                 self.spawn_timer += 1
                 if self.spawn_timer > 90:
-                    sx = int(self.player.rect.x + random.choice([-600, 800, 1000]))
-                    sx = max(100, min(sx, self.level.width - 80))
-                    e = Enemy(sx, random.randint(100, self.level.height - 120), kind=random.choice(["patrol", "fly"]))
-                    self.level.enemies.add(e)
+                    sx = int(pr.x + random.choice([-600, 800, 1000]))
+                    sx = max(100, min(sx, lw - 80))
+                    e = Enemy(sx, random.randint(100, lh - 120), kind=random.choice(["patrol", "fly"]))
+                    enemy_group.add(e)
                     self.spawn_timer = 0
 
     def draw(self, surf):
         # background
-        bg = pygame.Surface((WIDTH, HEIGHT))
-        self.level.draw_background(bg, self.camera)
-        surf.blit(bg, (0, 0))
+        self.level.draw_background(surf, self.camera)
 
         # parallax distant shapes
-        # draw platforms and sprites with camera
-        for p in self.level.platforms:
-            surf.blit(p.image, self.camera.apply(p.rect))
-        for e in self.level.enemies:
-            surf.blit(e.image, self.camera.apply(e.rect))
+        # draw platforms and sprites with camera, skipping anything off-screen
+        ox, oy = -self.camera.offset_x, -self.camera.offset_y
+        view = pygame.Rect(-ox, -oy, WIDTH, HEIGHT)
+        # within each layer, order by source surface so identical images are blitted consecutively
+        visible = sorted((p for p in self.level.query(view) if view.colliderect(p.rect)),
+                         key=lambda p: id(p.image))
+        blit_list = [(p.image, (p.rect.x + ox, p.rect.y + oy)) for p in visible]
+        visible = sorted((e for e in self.level.enemies if view.colliderect(e.rect)),
+                         key=lambda e: id(e.image))
+        blit_list += [(e.image, (e.rect.x + ox, e.rect.y + oy)) for e in visible]
 
         # bullets
-        for b in self.bullets:
-            surf.blit(b.image, self.camera.apply(b.rect))
-        for b in self.enemy_bullets:
-            surf.blit(b.image, self.camera.apply(b.rect))
+        for pool in (self.bullets, self.enemy_bullets):
+            for i in pool.visible(view):
+                r = pool.rect(i)
+                blit_list.append((pool.image(i), (r.x + ox, r.y + oy)))
 
         # player
-        surf.blit(self.player.image, self.camera.apply(self.player.rect))
-
-        # HUD
-        self.hud_surf.fill((0, 0, 0, 0))
-        draw_text(self.hud_surf, f"Score: {self.player.score}", 20, 12, 8)
-        draw_text(self.hud_surf, f"Lives: {self.player.lives}", 20, 160, 8)
-        # health bar
-        draw_text(self.hud_surf, "Health:", 20, 260, 8)
-        for i in range(self.player.max_health):
-            col = (200, 20, 20) if i < self.player.health else (100, 100, 100)
-            pygame.draw.rect(self.hud_surf, col, (335 + i * 18, 10, 14, 14))
+        blit_list.append((self.player.image, (self.player.rect.x + ox, self.player.rect.y + oy)))
+        blit_many(surf, blit_list)
+
+        # HUD, redrawn only when one of its values changes
+        hud_state = (self.player.score, self.player.lives, self.player.health)
+        if hud_state != self._hud_state:
+            self._hud_state = hud_state
+            self.hud_surf.fill((0, 0, 0, 0))
+            draw_text(self.hud_surf, f"Score: {self.player.score}", 20, 12, 8)
+            draw_text(self.hud_surf, f"Lives: {self.player.lives}", 20, 160, 8)
+            # health bar
+            draw_text(self.hud_surf, "Health:", 20, 260, 8)
+            for i in range(self.player.max_health):
+                col = (200, 20, 20) if i < self.player.health else (100, 100, 100)
+                pygame.draw.rect(self.hud_surf, col, (335 + i * 18, 10, 14, 14))
         surf.blit(self.hud_surf, (0, 0))
 
         # mini map indicator for level end (simple)
-        draw_text(surf, "Level length: " + str(self.level.width), font, WIDTH - 220, 8)
+        surf.blit(self.level.length_label, (WIDTH - 220, 8))
 
     def title_screen(self, surf):
         surf.fill(SKY2)
@@ -466,7 +644,6 @@ def main():
 
     while running:
         clock.tick(FPS)
-        keys = pygame.key.get_pressed()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -478,9 +655,7 @@ def main():
                         game.state = "playing"
                 elif game.state == "playing":
                     if event.key in (pygame.K_UP, pygame.K_w, pygame.K_SPACE):
-                        game.player.jump(game.level.platforms)
-                    if event.key == pygame.K_j:
-                        game.player.shoot(game.bullets)
+                        game.player.jump(game.level)
                     if event.key == pygame.K_p:
                         game.state = "paused"
                 elif game.state == "paused":
@@ -491,13 +666,11 @@ def main():
                         game.reset()
                         game.state = "playing"
 
-        # quick keys outside events (hold shooting)
+        # update; shooting is hold-to-fire only, gated by the player's cooldown
         if game.state == "playing":
-            if keys[pygame.K_j]:
+            keys = pygame.key.get_pressed()
+            if keys[K_SHOOT]:
                 game.player.shoot(game.bullets)
-
-        # update
-        if game.state == "playing":
             game.update(dt, keys)
 
         # draw